@@ -0,0 +1,200 @@
+from DatabaseHandler import DatabaseManager
+from Retriever import Retriever
+from Reranker import Reranker
+from Generator import Generator
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+import torch
+from dotenv import load_dotenv
+
+TIMING_FIELDS = ["encodeTime", "searchTime", "fetchTime", "rerankTime", "generateTime"]
+FIELDNAMES = ["id", "question", "answer", "sectionNumbers"] + TIMING_FIELDS
+
+def loadQuestions(input_path:str):
+    """
+    Loads the questions from a JSONL file (one {"question": ..., "id": ...} object per line)
+    or a CSV file (with a "question" column and an optional "id" column).
+    Questions without an id get a hash of their text as id, so ids stay stable if the file is edited between runs.
+
+    Returns:
+        list of dict: Each dict has the keys id and question.
+    Rows whose question is blank are skipped.
+
+    Raises:
+        ValueError: If a row has no question field at all, or if two questions have the same id.
+    """
+    questions = []
+    if input_path.lower().endswith(".csv"):
+        # utf-8-sig drops the BOM Excel writes, otherwise the header is read as "\ufeffquestion"
+        with open(input_path, newline='', encoding='utf-8-sig') as file:
+            rows = list(csv.DictReader(file))
+    else:
+        with open(input_path, encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file if line.strip()]
+
+    seenIds = set()
+    for row in rows:
+        if "question" not in row:
+            raise ValueError(f"Row without a 'question' field in {input_path} (fields found: {', '.join(row)})")
+        question = str(row["question"] or "").strip()
+        if not question:
+            continue
+        # only a missing or blank id falls back to the hash, an id of 0 or false is kept as is
+        questionId = row.get("id")
+        if questionId is None:
+            questionId = ""
+        elif isinstance(questionId, str):
+            questionId = questionId.strip()
+        else:
+            questionId = json.dumps(questionId) # JSONL ids like 0 or false are written the way they appear in the input
+        if questionId == "":
+            questionId = hashlib.sha256(question.encode("utf-8")).hexdigest()[:16]
+        if questionId in seenIds:
+            raise ValueError(f"Duplicate question id '{questionId}' in {input_path} (questions without an id are identified by their text)")
+        seenIds.add(questionId)
+        questions.append({"id": questionId, "question": question})
+    return questions
+
+def loadAnsweredIds(output_path:str):
+    """
+    Reads the ids of the questions already answered in the output CSV so an interrupted run can resume.
+    A row with empty timing columns, or a last row not ended by a newline, was cut off by an interruption:
+    it does not count as answered. The file is always rewritten with only the complete rows, so the next
+    rows are never appended to a half-written line.
+
+    Returns:
+        set of str: The ids already in the output file.
+    """
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, newline='', encoding='utf-8') as file:
+        content = file.read()
+    allRows = list(csv.DictReader(io.StringIO(content)))
+    rows = allRows
+    # a cut in the middle of the last value still fills every column, only the missing newline gives it away
+    if rows and not content.endswith("\n"):
+        rows = rows[:-1]
+    completeRows = [row for row in rows if all(row.get(field) for field in TIMING_FIELDS)]
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(completeRows)
+    os.replace(tmp_path, output_path)
+    numDropped = len(allRows) - len(completeRows)
+    if numDropped:
+        print(f"Dropped {numDropped} incomplete rows from {output_path}.")
+    return {row["id"] for row in completeRows}
+
+def answerBatch(batch, db, retriever, reranker, generator, relevantSections=20, topK=4, maxNewTokens=256):
+    """
+    Answers one batch of questions, running every stage once for the whole batch:
+    query encoding, one matrix FAISS search, a single DB fetch, cross-encoder scoring and generation.
+
+    Returns:
+        list of dict: One output row per question with the answer, cited section numbers and
+                      per-stage timings (stage time divided by the batch size).
+    """
+    queries = [q["question"] for q in batch]
+    timings = {}
+
+    start = time.perf_counter()
+    queryVectors = retriever.encodeQueries(queries)
+    timings["encodeTime"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    topIdsPerQuery = retriever.searchBatch(queryVectors, top_k=relevantSections)
+    timings["searchTime"] = time.perf_counter() - start
+
+    # fetch the union of every retrieved section once instead of querying the database per question
+    start = time.perf_counter()
+    allIds = list({sectionId for topIds in topIdsPerQuery for sectionId in topIds})
+    sectionsById = {}
+    if allIds:
+        contents, ids, sectionNumbers = db.giveSections(allIds)
+        sectionsById = {sectionId: (content, number) for content, sectionId, number in zip(contents, ids, sectionNumbers)}
+    timings["fetchTime"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidatesPerQuery = [[sectionsById[sectionId] for sectionId in topIds if sectionId in sectionsById] for topIds in topIdsPerQuery]
+    rankedPerQuery = reranker.rerankBatch(queries, [[content for content, _ in candidates] for candidates in candidatesPerQuery], top_k=topK)
+    contextsPerQuery = [[candidates[i][0] for i in ranked] for candidates, ranked in zip(candidatesPerQuery, rankedPerQuery)]
+    sectionNumbersPerQuery = [[candidates[i][1] for i in ranked] for candidates, ranked in zip(candidatesPerQuery, rankedPerQuery)]
+    timings["rerankTime"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    answers = generator.generateBatch(queries, contextsPerQuery, sectionNumbersPerQuery, max_new_tokens=maxNewTokens)
+    timings["generateTime"] = time.perf_counter() - start
+
+    rows = []
+    for q, answer, sectionNumbers in zip(batch, answers, sectionNumbersPerQuery):
+        row = {"id": q["id"], "question": q["question"], "answer": answer, "sectionNumbers": ";".join(str(n) for n in sectionNumbers)}
+        row.update({stage: f"{seconds / len(batch):.4f}" for stage, seconds in timings.items()})
+        rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a file of questions offline and store the answers to a CSV file.")
+    parser.add_argument("input_path", help="JSONL or CSV file of questions")
+    parser.add_argument("output_path", help="CSV file the answers are appended to (existing answers are skipped)")
+    parser.add_argument("--batch-size", type=int, default=8, help="number of questions processed per batch")
+    parser.add_argument("--relevant-sections", type=int, default=20, help="number of sections retrieved per question")
+    parser.add_argument("--top-k", type=int, default=4, help="number of reranked sections given to the generator")
+    parser.add_argument("--max-new-tokens", type=int, default=256, help="maximum length of each answer in tokens")
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="number of CPU threads used by torch")
+    args = parser.parse_args()
+
+    # === Questions left to answer ===
+    questions = loadQuestions(args.input_path)
+    answeredIds = loadAnsweredIds(args.output_path)
+    pending = [q for q in questions if q["id"] not in answeredIds]
+    print(f"{len(answeredIds)} questions already answered, {len(pending)} left.")
+    if not pending:
+        return
+    # similar length questions in a batch means less padding in the encoder, cross-encoder and generator
+    pending.sort(key=lambda q: len(q["question"]))
+
+    # === Load .env ===
+    load_dotenv()
+    creds = {k: os.getenv(k) for k in ["user", "password", "host", "port", "dbname"]}
+
+    # === Database ===
+    url = f"postgresql+psycopg2://{creds['user']}:{creds['password']}@{creds['host']}:{creds['port']}/{creds['dbname']}"
+    db = DatabaseManager(url)
+    contents, ids = db.giveSections()
+
+    # === RAG Components ===
+    torch.set_num_threads(args.threads)
+    retriever = Retriever()
+    retriever.add(contents, ids)
+    reranker = Reranker()
+    generator = Generator()
+
+    # === Batch loop ===
+    writeHeader = not os.path.exists(args.output_path) or os.path.getsize(args.output_path) == 0
+    with open(args.output_path, mode='a', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+        if writeHeader:
+            writer.writeheader()
+        runStart = time.perf_counter()
+        for batchStart in range(0, len(pending), args.batch_size):
+            batch = pending[batchStart:batchStart + args.batch_size]
+            rows = answerBatch(batch, db, retriever, reranker, generator, args.relevant_sections, args.top_k, args.max_new_tokens)
+            # build the whole batch first and write it at once, then flush so an interrupted run keeps all finished answers
+            buffer = io.StringIO()
+            csv.DictWriter(buffer, fieldnames=FIELDNAMES).writerows(rows)
+            file.write(buffer.getvalue())
+            file.flush()
+            os.fsync(file.fileno())
+            done = batchStart + len(batch)
+            elapsed = time.perf_counter() - runStart
+            print(f"{done}/{len(pending)} answered ({done / elapsed * 3600:.0f} questions/hour)")
+
+if __name__ == "__main__":
+    main()
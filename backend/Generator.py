@@ -2,6 +2,7 @@
 # LAST MODIFIED DATE: SEPT 3, 2025
 
 from transformers import AutoModelForCausalLM, AutoTokenizer
+import torch
 
 class Generator:
     """
@@ -9,8 +10,10 @@ class Generator:
 
     Attributes:
         model_name (str): The name of the pre-trained model to use.
+        device (str): The device the model runs on ("cuda" when available, otherwise "cpu").
     Methods:
         generate(query, contexts, section_numbers): Generates a response based on the query and contexts.
+        generateBatch(queries, contextsPerQuery, sectionNumbersPerQuery, max_new_tokens): Generates responses for many queries at once.
     """
 
     """
@@ -22,9 +25,10 @@ class Generator:
     - meta-llama/Llama-3.2-1B (currently using this one, 1.2B parameters: neutral reasoning, good english)
     """
     
-    def __init__(self, model_name="meta-llama/Llama-3.2-1B-Instruct"):
+    def __init__(self, model_name="meta-llama/Llama-3.2-1B-Instruct", device=None):
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForCausalLM.from_pretrained(model_name).to("cuda")
+        self.model = AutoModelForCausalLM.from_pretrained(model_name).to(self.device)
 
     def cleanText(self, raw_response):
         """
@@ -49,6 +53,24 @@ class Generator:
         # Slice and clean
         return raw_response[start_idx:end_idx].strip()
 
+    def buildContext(self, contexts, section_numbers):
+        """
+        Formats the contexts and their page numbers into the numbered context block of the prompt.
+        """
+        return "\n".join(
+            [f"[{i+1}] content: {contentText} page: {page}" for i, (contentText, page) in enumerate(zip(contexts, section_numbers))]
+        )
+
+    def buildPrompt(self, query, context_str):
+        """
+        Builds the chat prompt for the query and context block using the HuggingFace chat template.
+        """
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant specialized in Engineering Manuals and Engineering Principles. Answer ONLY using the given manual."},
+            {"role": "user", "content": f"""Context:\n{context_str}\n\nQuestion: {query}\n\nAnswer concisely and accurately based on the above context."""}
+        ]
+        return self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+
     def generate(self, query, contexts, section_numbers):
         """
         Generates a response based on the query and contexts.
@@ -61,23 +83,15 @@ class Generator:
         Returns:
             - str: The generated response.
         """
-        context_str = "\n".join(
-            [f"[{i+1}] content: {contentText} page: {page}" for i, (contentText, page) in enumerate(zip(contexts, section_numbers))]
-        )
+        context_str = self.buildContext(contexts, section_numbers)
 
         # for debugging purposes
         tokenized_contexts = self.tokenizer(context_str)
         print(context_str, "\n\n\n\n")
         print("the len of content tokens is: ",len(tokenized_contexts['input_ids']))
 
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant specialized in Engineering Manuals and Engineering Principles. Answer ONLY using the given manual."},
-            {"role": "user", "content": f"""Context:\n{context_str}\n\nQuestion: {query}\n\nAnswer concisely and accurately based on the above context."""}
-        ]
-
-        # Use HuggingFace chat template
-        prompt = self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        inputs = self.tokenizer(prompt, return_tensors="pt").to("cuda")
+        prompt = self.buildPrompt(query, context_str)
+        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
 
         outputs = self.model.generate(
             **inputs,
@@ -89,3 +103,39 @@ class Generator:
         clean_response = self.cleanText(raw_response)
 
         return clean_response
+
+    def generateBatch(self, queries, contextsPerQuery, sectionNumbersPerQuery, max_new_tokens=256):
+        """
+        Generates responses for many queries with a single padded generate call.
+
+        Parameters:
+            - queries (list of str): The user's queries.
+            - contextsPerQuery (list of list of str): The contexts of each query.
+            - sectionNumbersPerQuery (list of list of int): The page numbers of the contexts of each query.
+            - max_new_tokens (int): The maximum number of tokens generated per response.
+
+        Returns:
+            - list of str: The generated responses, in the same order as the queries.
+        """
+        prompts = [
+            self.buildPrompt(query, self.buildContext(contexts, section_numbers))
+            for query, contexts, section_numbers in zip(queries, contextsPerQuery, sectionNumbersPerQuery)
+        ]
+
+        # decoder-only models must be padded on the left so every prompt ends right before its generated tokens
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.tokenizer.padding_side = "left"
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, add_special_tokens=False).to(self.device)
+
+        with torch.inference_mode():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                eos_token_id=self.tokenizer.eos_token_id,
+                pad_token_id=self.tokenizer.pad_token_id,
+            )
+
+        # keep only the generated part of each row
+        generated = outputs[:, inputs["input_ids"].shape[1]:]
+        return [self.tokenizer.decode(row, skip_special_tokens=True).strip() for row in generated]
@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 
 def main():
     # === Load PDF ===
-    x = PdfReader("sample.pdf")
+    x = PdfReader("sample.pdf", cache_dir="pdf_cache") # raw page text is cached, re-runs skip the PDF decode
     x.extractText()
 
     # === Load .env ===
@@ -2,8 +2,72 @@
 # LAST MODIFIED DATE: SEPT 3, 2025
 
 import pdfplumber
+import pypdfium2 as pdfium
+import hashlib
+import json
+import os
 import re
 import csv
+import time
+
+class PdfplumberExtractor:
+    """
+    A text extraction backend that uses pdfplumber's layout-aware extract_text.
+    Slower, but keeps the original reading order of the manual.
+    Methods:
+        extractPages(file_path): Yields the raw text of every page of the PDF file.
+    """
+    name = "pdfplumber"
+    version = 1 # bump whenever the extracted text changes, so old cache files are not reused
+
+    def extractPages(self, file_path:str):
+        """
+        Yields the raw text of every page of the PDF file.
+        Args:
+            file_path (str): The path to the PDF file.
+        Yields:
+            str: The raw text of the page ("" when the page has no text).
+        """
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+
+class PypdfiumExtractor:
+    """
+    A text extraction backend that uses pypdfium2's plain text extraction.
+    Much faster than pdfplumber since it skips the layout analysis.
+    Methods:
+        extractPages(file_path): Yields the raw text of every page of the PDF file.
+    """
+    name = "pypdfium2"
+    version = 2 # bump whenever the extracted text changes, so old cache files are not reused (2: lines are stripped)
+
+    def extractPages(self, file_path:str):
+        """
+        Yields the raw text of every page of the PDF file.
+        Args:
+            file_path (str): The path to the PDF file.
+        Yields:
+            str: The raw text of the page ("" when the page has no text).
+        """
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            for pagenum in range(len(pdf)):
+                page = pdf[pagenum]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                # pdfium keeps "\r\n" line breaks and leading spaces, strip every line like pdfplumber does
+                # so section_title_pattern behaves the same on both backends
+                yield "\n".join(line.strip() for line in text.splitlines()).strip()
+        finally:
+            pdf.close()
+
+EXTRACTORS = {
+    PdfplumberExtractor.name: PdfplumberExtractor,
+    PypdfiumExtractor.name: PypdfiumExtractor,
+}
 
 class PdfReader:
     """
@@ -11,43 +75,102 @@ class PdfReader:
     Attributes:
         file_path (str): The path to the PDF file.
         extracted_text (list): A list to store extracted text sections with their page numbers and titles.
+        extractor: The text extraction backend ("pdfplumber" or "pypdfium2").
+        cache_dir (str): Folder where the raw text of each page is cached, None to disable the cache.
 
     Methods:
         extractText(): Extracts text from the PDF file.
+        extractPages(): Returns the raw text of every page, using the cache when available.
+        parseSections(pages): Splits the raw page texts into sections.
         storeToCSV(output_path): Stores the extracted text to a CSV file.
+        compareBackends(): Measures the pages/s of each backend and checks if their sections match.
         extractImages(): Extracts images from the PDF file.
     """
-    def __init__(self, file_path:str):
+    def __init__(self, file_path:str, backend:str="pdfplumber", cache_dir:str=None):
+        if backend not in EXTRACTORS:
+            raise ValueError(f"Unknown extraction backend '{backend}', choose from: {', '.join(EXTRACTORS)}")
         self.file_path = file_path
         self.extracted_text = [] # list of dictionary having page number, section title, section content
         self.section_title_pattern = re.compile(r'^\d+(\.\d+)*\s+.+', re.MULTILINE) # Regular expression for section titles (e.g., "1. Introduction", "2.1 Overview")
-        
+        self.extractor = EXTRACTORS[backend]()
+        self.cache_dir = cache_dir
+
+    def fileHash(self):
+        """
+        Computes the SHA-256 hash of the PDF file, used as the cache key.
+        Returns:
+            str: The hex digest of the file.
+        """
+        sha = hashlib.sha256()
+        with open(self.file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def cachePath(self):
+        """
+        Returns the path of the cache file of this PDF for the current backend and its output format version.
+        """
+        return os.path.join(self.cache_dir, f"{self.fileHash()}_{self.extractor.name}_v{self.extractor.version}.json")
+
+    def extractPages(self):
+        """
+        Returns the raw text of every page of the PDF file. If a cache folder is set, the pages are read from
+        the cache (keyed by file hash, backend version and page number) and the PDF is only decoded on a cache miss.
+        Returns:
+            list of str: The raw text of each page, in page order.
+        """
+        if not self.cache_dir:
+            return list(self.extractor.extractPages(self.file_path))
+
+        cache_path = self.cachePath()
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as file:
+                cached = json.load(file) # {page number: raw text}
+            return [cached[str(pagenum + 1)] for pagenum in range(len(cached))]
+
+        pages = list(self.extractor.extractPages(self.file_path))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # write to a temp file first so an interrupted run never leaves a half written cache
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, mode="w", encoding="utf-8") as file:
+            json.dump({str(pagenum + 1): text for pagenum, text in enumerate(pages)}, file)
+        os.replace(tmp_path, cache_path)
+        return pages
+
+    def parseSections(self, pages):
+        """
+        Splits the raw page texts into sections using section_title_pattern.
+        Args:
+            pages (list of str): The raw text of each page, in page order.
+        Returns:
+            list: A list of dictionary having page number, section title, section content.
+        """
+        sections = []
+        for pagenum, text in enumerate(pages):
+            if text:
+                # Find all section titles and their positions
+                matches = list(self.section_title_pattern.finditer(text))
+                for idx, match in enumerate(matches):
+                    section_title = match.group().strip().replace("\n", " ")
+                    start = match.end()
+                    end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+                    section_content = text[start:end].strip().replace("\n", " ")
+                    if section_content and not re.search(r"\.{5,}", section_title):
+                        sections.append({
+                            "sectionNumber": pagenum + 1,
+                            "sectionTitle": section_title,
+                            "sectionContent": section_content
+                        })
+        return sections
+
     def extractText(self):
         """
         Extracts text from the PDF file.
         Returns:
             str: The extracted text.
         """
-        with pdfplumber.open(self.file_path) as pdf:
-            for pagenum, page in enumerate(pdf.pages):
-                # REMOVE ONCE DONE TESTING
-                '''if pagenum == 25:
-                    break'''
-                text = page.extract_text()
-                if text:
-                    # Find all section titles and their positions
-                    matches = list(self.section_title_pattern.finditer(text))
-                    for idx, match in enumerate(matches):
-                        section_title = match.group().strip().replace("\n", " ")
-                        start = match.end()
-                        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-                        section_content = text[start:end].strip().replace("\n", " ")
-                        if section_content and not re.search(r"\.{5,}", section_title):
-                            self.extracted_text.append({
-                                "sectionNumber": pagenum + 1,
-                                "sectionTitle": section_title,
-                                "sectionContent": section_content
-                            })
+        self.extracted_text.extend(self.parseSections(self.extractPages()))
 
     def storeToCSV(self, output_path:str):
         """
@@ -61,6 +184,27 @@ class PdfReader:
             for row in self.extracted_text:
                 writer.writerow(row)
 
+    def compareBackends(self):
+        """
+        Extracts the PDF file with every backend (bypassing the cache), measures their speed in pages/s
+        and checks if the parsed sections match across backends.
+        Returns:
+            dict: {backend name: pages/s} and "sectionsMatch" (bool), True if all backends give the same sections.
+        """
+        results = {}
+        allSections = []
+        for name, extractorClass in EXTRACTORS.items():
+            start = time.perf_counter()
+            pages = list(extractorClass().extractPages(self.file_path))
+            elapsed = time.perf_counter() - start
+            results[name] = len(pages) / elapsed if elapsed > 0 else float("inf")
+            # compare the exact sections extractText would store, since those are the rows inserted in the database
+            allSections.append(self.parseSections(pages))
+            print(f"{name}: {len(pages)} pages in {elapsed:.2f}s ({results[name]:.1f} pages/s), {len(allSections[-1])} sections")
+        results["sectionsMatch"] = all(sections == allSections[0] for sections in allSections[1:])
+        print(f"Sections match across backends: {results['sectionsMatch']}")
+        return results
+
     def extractImages(self):
         """
         Extracts images from the PDF file.
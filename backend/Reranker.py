@@ -7,6 +7,7 @@ class Reranker:
         model_name (str): The name of the pre-trained cross-encoder model to use.
     Methods:
         rerank(query, passages, top_k): Reranks the given passages based on their relevance to the query.
+        rerankBatch(queries, passagesPerQuery, top_k, batch_size): Reranks the passages of many queries with one cross-encoder pass.
     """
     def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-6-v2"):
         self.model = CrossEncoder(model_name)
@@ -31,4 +32,30 @@ class Reranker:
         # Combine passages with their scores and sort them
         rankedPassage = sorted(zip(passages, scores), key=lambda x: x[1], reverse=True)
         
-        return [p for p, _ in rankedPassage[:top_k]]
\ No newline at end of file
+        return [p for p, _ in rankedPassage[:top_k]]
+
+    def rerankBatch(self, queries, passagesPerQuery, top_k=4, batch_size=32):
+        """
+        Reranks the passages of many queries at once by scoring all (query, passage) pairs in a single cross-encoder pass.
+
+        Parameters:
+            - queries (list of str): The user's queries.
+            - passagesPerQuery (list of list of str): The passages to be reranked for each query.
+            - top_k (int): The number of passages to keep per query.
+            - batch_size (int): The number of pairs scored per forward pass.
+
+        Returns:
+            - list of lists of int: For each query, the indices (into its passages) of the top_k passages, best first.
+        """
+        # Flatten every pair so the cross-encoder sees full batches instead of one query at a time
+        inputs = [[query, passage] for query, passages in zip(queries, passagesPerQuery) for passage in passages]
+        scores = self.model.predict(inputs, batch_size=batch_size) if inputs else []
+
+        rankedIndices = []
+        start = 0
+        for passages in passagesPerQuery:
+            queryScores = scores[start:start + len(passages)]
+            start += len(passages)
+            ranked = sorted(range(len(passages)), key=lambda i: queryScores[i], reverse=True)
+            rankedIndices.append(ranked[:top_k])
+        return rankedIndices
@@ -15,6 +15,8 @@ class Retriever:
     Methods:
         add(contents, ids): Adds new sections to the vector index.
         search(query, top_k): Searches for the most relevant sections based on the query.
+        encodeQueries(queries, batch_size): Encodes many queries at once into a matrix of query vectors.
+        searchBatch(query_vectors, top_k): Searches the index for many queries with a single matrix search.
     """
     def __init__(self, embedding_model="all-MiniLM-L6-v2", embedding_dim=384):
         self.embedding_dim = embedding_dim
@@ -45,4 +47,26 @@ class Retriever:
         """
         query_vector = self.embedding_model.encode([query], convert_to_numpy=True).astype("float32")
         distances, indices = self.index.search(query_vector, top_k)
-        return [self.id_map[idx] for idx in indices[0] if idx in self.id_map]
\ No newline at end of file
+        return [self.id_map[idx] for idx in indices[0] if idx in self.id_map]
+
+    def encodeQueries(self, queries, batch_size=32):
+        """
+        Encodes many queries at once into a matrix of query vectors.
+        Parameters:
+            - queries (list of str): The user's queries.
+            - batch_size (int): The number of queries encoded per forward pass.
+        """
+        return self.embedding_model.encode(queries, batch_size=batch_size, convert_to_numpy=True).astype("float32")
+
+    def searchBatch(self, query_vectors, top_k=20):
+        """
+        Searches the index for many queries with a single matrix search.
+        Parameters:
+            - query_vectors (np.ndarray): The query vectors, one row per query (see encodeQueries).
+            - top_k (int): The number of top relevant sections to retrieve per query.
+
+        Returns:
+            - list of lists of int: The section IDs retrieved for each query.
+        """
+        distances, indices = self.index.search(query_vectors, top_k)
+        return [[self.id_map[idx] for idx in row if idx in self.id_map] for row in indices]